@@ -1,12 +1,103 @@
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 import os
 
+# Set plot style once at import (also applies in worker processes)
+plt.style.use('seaborn-v0_8')
+sns.set_palette("husl")
+
+
+def _plot_ad_type(ad_type_counts, path, dpi):
+    """Ad type pie chart"""
+    plt.figure(figsize=(10, 6))
+    plt.pie(ad_type_counts.values, labels=ad_type_counts.index, autopct='%1.1f%%')
+    plt.title('Ad Type Distribution')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def _plot_position(position_counts, path, dpi):
+    """Ad position bar chart"""
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x=position_counts.index, y=position_counts.values)
+    plt.title('Ad Position Distribution')
+    plt.ylabel('Count')
+    plt.xlabel('Position')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def _plot_duration(durations, path, dpi):
+    """Ad duration histogram and box plot"""
+    fig, (ax_hist, ax_box) = plt.subplots(1, 2, figsize=(12, 6))
+    durations.hist(bins=20, alpha=0.7, edgecolor='black', ax=ax_hist)
+    ax_hist.set_title('Ad Duration Distribution')
+    ax_hist.set_xlabel('Duration (seconds)')
+    ax_hist.set_ylabel('Frequency')
+    
+    sns.boxplot(y=durations, ax=ax_box)
+    ax_box.set_title('Ad Duration Box Plot')
+    ax_box.set_ylabel('Duration (seconds)')
+    
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+
+def _plot_temporal(hourly_dist, daily_dist, daily_timeline, path, dpi):
+    """Hourly, daily and timeline panels on one figure"""
+    fig = plt.figure(figsize=(15, 8))
+    
+    # Hourly distribution
+    ax = fig.add_subplot(2, 2, 1)
+    ax.bar(hourly_dist.index, hourly_dist.values)
+    ax.set_title('Ads by Hour of Day')
+    ax.set_xlabel('Hour')
+    ax.set_ylabel('Ad Count')
+    
+    # Daily distribution
+    ax = fig.add_subplot(2, 2, 2)
+    ax.bar(daily_dist.index, daily_dist.values)
+    ax.set_title('Ads by Day of Week')
+    ax.set_xlabel('Day')
+    ax.set_ylabel('Ad Count')
+    ax.tick_params(axis='x', rotation=45)
+    
+    # Timeline
+    ax = fig.add_subplot(2, 1, 2)
+    daily_timeline.plot(kind='line', marker='o', ax=ax)
+    ax.set_title('Ad Detection Timeline')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Ads per Day')
+    ax.tick_params(axis='x', rotation=45)
+    
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+
+def _render(task):
+    """Run one (plot_function, args) task in a worker process"""
+    plot_func, args = task
+    plot_func(*args)
+
+
+# Extension export field -> DataFrame column
+EVENT_COLUMNS = {
+    'videoId': 'video_id',
+    'adType': 'ad_type',
+    'position': 'position',
+    'duration': 'duration',
+    'videoTime': 'video_time',
+    'startTime': 'start_ms',
+}
+
+
 class YouTubeAdAnalyzer:
     def __init__(self, json_file_path):
         self.data_file = json_file_path
@@ -16,31 +107,38 @@ class YouTubeAdAnalyzer:
     def load_data(self):
         """Load ad events from JSON file"""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Parse straight into a frame; dtype=False keeps IDs like "0123" as strings
+            data = pd.read_json(self.data_file, orient='records', dtype=False, convert_dates=False)
             print(f"Loaded {len(data)} ad events")
             return data
         except Exception as e:
             print(f"Error loading data: {e}")
-            return []
+            return pd.DataFrame()
     
     def create_dataframe(self):
         """Convert ad events to pandas DataFrame"""
-        if not self.ad_events:
+        if self.ad_events.empty:
             return pd.DataFrame()
         
-        df_data = []
-        for event in self.ad_events:
-            df_data.append({
-                'video_id': event.get('videoId', 'unknown'),
-                'ad_type': event.get('adType', 'unknown'),
-                'position': event.get('position', 'unknown'),
-                'duration': event.get('duration', 0),
-                'video_time': event.get('videoTime', 0),
-                'timestamp': pd.to_datetime(event.get('startTime', 0), unit='ms')
-            })
+        # Missing fields get the same defaults as absent keys in the export
+        df = self.ad_events.reindex(columns=list(EVENT_COLUMNS)).rename(columns=EVENT_COLUMNS)
+        df = df.fillna({'video_id': 'unknown', 'ad_type': 'unknown', 'position': 'unknown',
+                        'duration': 0, 'video_time': 0, 'start_ms': 0})
+        # Second-level durations don't need float64 precision
+        df = df.astype({'duration': 'float32', 'video_time': 'float32'})
+        
+        # Parse all timestamps in one vectorized call
+        df['timestamp'] = pd.to_datetime(df.pop('start_ms'), unit='ms', cache=True)
         
-        return pd.DataFrame(df_data)
+        # Derive time-of-day fields once for the report and plots
+        df['hour'] = df['timestamp'].dt.hour.astype('int8')
+        df['dayname'] = df['timestamp'].dt.day_name().astype('category')
+        
+        # Low-cardinality labels as categories for cheaper value_counts/groupby
+        for col in ('ad_type', 'position', 'video_id'):
+            df[col] = df[col].astype('category')
+        
+        return df
     
     def generate_summary_report(self):
         """Generate comprehensive summary report"""
@@ -55,7 +153,9 @@ class YouTubeAdAnalyzer:
         # Basic statistics
         total_ads = len(self.df)
         unique_videos = self.df['video_id'].nunique()
-        avg_duration = self.df['duration'].mean()
+        # One pass for all duration statistics
+        duration_stats = self.df['duration'].agg(['mean', 'min', 'max', 'median'])
+        avg_duration = duration_stats['mean']
         
         report.append(f"Total Ads Detected: {total_ads}")
         report.append(f"Unique Videos: {unique_videos}")
@@ -77,37 +177,36 @@ class YouTubeAdAnalyzer:
         
         # Duration analysis
         report.append("\\nDuration Analysis:")
-        report.append(f"  Shortest Ad: {self.df['duration'].min():.1f}s")
-        report.append(f"  Longest Ad: {self.df['duration'].max():.1f}s")
-        report.append(f"  Median Duration: {self.df['duration'].median():.1f}s")
+        report.append(f"  Shortest Ad: {duration_stats['min']:.1f}s")
+        report.append(f"  Longest Ad: {duration_stats['max']:.1f}s")
+        report.append(f"  Median Duration: {duration_stats['median']:.1f}s")
         
         # Video-specific analysis
         if unique_videos > 1:
             report.append("\\nPer-Video Analysis:")
-            video_stats = self.df.groupby('video_id').agg({
-                'duration': ['count', 'mean', 'sum']
-            }).round(1)
+            video_stats = self.df.groupby('video_id', sort=False, observed=True).agg(
+                ads_count=('duration', 'size'),
+                avg_dur=('duration', 'mean'),
+                total_dur=('duration', 'sum')
+            ).head(5)  # Top 5 videos
             
-            for video_id in video_stats.index[:5]:  # Top 5 videos
-                ads_count = video_stats.loc[video_id, ('duration', 'count')]
-                avg_dur = video_stats.loc[video_id, ('duration', 'mean')]
-                total_dur = video_stats.loc[video_id, ('duration', 'sum')]
-                report.append(f"  {video_id}: {ads_count} ads, {avg_dur:.1f}s avg, {total_dur:.1f}s total")
+            for row in video_stats.itertuples():
+                report.append(f"  {row.Index}: {row.ads_count} ads, {row.avg_dur:.1f}s avg, {row.total_dur:.1f}s total")
         
         # Time-based patterns
         if 'timestamp' in self.df.columns:
             report.append("\\nTemporal Patterns:")
-            hourly_dist = self.df['timestamp'].dt.hour.value_counts().sort_index()
+            hourly_dist = self.df['hour'].value_counts().sort_index()
             peak_hour = hourly_dist.idxmax()
             report.append(f"  Peak Ad Hour: {peak_hour}:00 ({hourly_dist[peak_hour]} ads)")
             
-            daily_dist = self.df['timestamp'].dt.day_name().value_counts()
+            daily_dist = self.df['dayname'].value_counts()
             peak_day = daily_dist.idxmax()
             report.append(f"  Peak Ad Day: {peak_day} ({daily_dist[peak_day]} ads)")
         
         return "\\n".join(report)
     
-    def create_visualizations(self, output_dir="ad_analytics_plots"):
+    def create_visualizations(self, output_dir="ad_analytics_plots", dpi=150):
         """Generate visualization plots"""
         if self.df.empty:
             print("No data available for visualization")
@@ -116,92 +215,55 @@ class YouTubeAdAnalyzer:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Set style
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
-        
-        # 1. Ad Type Distribution
-        plt.figure(figsize=(10, 6))
-        ad_type_counts = self.df['ad_type'].value_counts()
-        plt.pie(ad_type_counts.values, labels=ad_type_counts.index, autopct='%1.1f%%')
-        plt.title('Ad Type Distribution')
-        plt.savefig(f'{output_dir}/ad_type_distribution.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        # 2. Ad Position Analysis
-        plt.figure(figsize=(10, 6))
-        position_counts = self.df['position'].value_counts()
-        sns.barplot(x=position_counts.index, y=position_counts.values)
-        plt.title('Ad Position Distribution')
-        plt.ylabel('Count')
-        plt.xlabel('Position')
-        plt.savefig(f'{output_dir}/ad_position_distribution.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        # 3. Duration Distribution
-        plt.figure(figsize=(12, 6))
-        plt.subplot(1, 2, 1)
-        self.df['duration'].hist(bins=20, alpha=0.7, edgecolor='black')
-        plt.title('Ad Duration Distribution')
-        plt.xlabel('Duration (seconds)')
-        plt.ylabel('Frequency')
-        
-        plt.subplot(1, 2, 2)
-        sns.boxplot(y=self.df['duration'])
-        plt.title('Ad Duration Box Plot')
-        plt.ylabel('Duration (seconds)')
-        
-        plt.tight_layout()
-        plt.savefig(f'{output_dir}/duration_analysis.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        # 4. Time-based analysis (if timestamp available)
+        # Compute all plot inputs up front so workers only render
+        tasks = [
+            (_plot_ad_type, (self.df['ad_type'].value_counts(), f'{output_dir}/ad_type_distribution.png', dpi)),
+            (_plot_position, (self.df['position'].value_counts(), f'{output_dir}/ad_position_distribution.png', dpi)),
+            (_plot_duration, (self.df['duration'], f'{output_dir}/duration_analysis.png', dpi)),
+        ]
+        
+        # Time-based analysis (if timestamp available)
         if 'timestamp' in self.df.columns and len(self.df) > 10:
-            plt.figure(figsize=(15, 8))
-            
-            # Hourly distribution
-            plt.subplot(2, 2, 1)
-            hourly_dist = self.df['timestamp'].dt.hour.value_counts().sort_index()
-            plt.bar(hourly_dist.index, hourly_dist.values)
-            plt.title('Ads by Hour of Day')
-            plt.xlabel('Hour')
-            plt.ylabel('Ad Count')
-            
-            # Daily distribution
-            plt.subplot(2, 2, 2)
-            daily_dist = self.df['timestamp'].dt.day_name().value_counts()
-            plt.bar(daily_dist.index, daily_dist.values)
-            plt.title('Ads by Day of Week')
-            plt.xlabel('Day')
-            plt.ylabel('Ad Count')
-            plt.xticks(rotation=45)
-            
-            # Timeline
-            plt.subplot(2, 1, 2)
-            daily_timeline = self.df.set_index('timestamp').resample('D').size()
-            daily_timeline.plot(kind='line', marker='o')
-            plt.title('Ad Detection Timeline')
-            plt.xlabel('Date')
-            plt.ylabel('Ads per Day')
-            plt.xticks(rotation=45)
-            
-            plt.tight_layout()
-            plt.savefig(f'{output_dir}/temporal_analysis.png', dpi=300, bbox_inches='tight')
-            plt.close()
+            hourly_dist = self.df['hour'].value_counts().sort_index()
+            daily_dist = self.df['dayname'].value_counts()
+            daily_timeline = self.df['timestamp'].dt.floor('D').value_counts().sort_index()
+            # Fill days without ads with zero, as resample('D') did
+            daily_timeline = daily_timeline.reindex(
+                pd.date_range(daily_timeline.index[0], daily_timeline.index[-1], freq='D'), fill_value=0)
+            tasks.append((_plot_temporal, (hourly_dist, daily_dist, daily_timeline,
+                                           f'{output_dir}/temporal_analysis.png', dpi)))
+        
+        # Rendering is CPU-bound and independent per figure
+        with ProcessPoolExecutor(max_workers=min(4, len(tasks))) as executor:
+            list(executor.map(_render, tasks))
         
         print(f"Visualizations saved to {output_dir}/")
     
-    def export_processed_data(self, output_file="processed_ad_data.csv"):
-        """Export processed data to CSV"""
-        if not self.df.empty:
-            self.df.to_csv(output_file, index=False)
-            print(f"Processed data exported to {output_file}")
+    def export_processed_data(self, output_file="processed_ad_data.parquet", file_format="parquet"):
+        """Export processed data to Parquet (default) or CSV"""
+        if self.df.empty:
+            return
+        
+        if file_format == 'parquet':
+            try:
+                self.df.to_parquet(output_file, compression='zstd', index=False)
+                print(f"Processed data exported to {output_file}")
+                return
+            except ImportError as e:
+                # No parquet engine (pyarrow/fastparquet) installed
+                print(f"Parquet export unavailable ({e}), falling back to CSV")
+                output_file = os.path.splitext(output_file)[0] + '.csv'
+        
+        self.df.to_csv(output_file, index=False)
+        print(f"Processed data exported to {output_file}")
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze YouTube ad data from Chrome extension')
     parser.add_argument('json_file', help='Path to JSON file exported from extension')
     parser.add_argument('--output-dir', default='ad_analytics', help='Output directory for reports and plots')
     parser.add_argument('--no-plots', action='store_true', help='Skip generating plots')
+    parser.add_argument('--publication', action='store_true', help='Save plots at 300 DPI instead of 150')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='parquet', help='File format for the processed data export')
     
     args = parser.parse_args()
     
@@ -223,10 +285,10 @@ def main():
     
     # Generate visualizations
     if not args.no_plots:
-        analyzer.create_visualizations(f'{args.output_dir}/plots')
+        analyzer.create_visualizations(f'{args.output_dir}/plots', dpi=300 if args.publication else 150)
     
     # Export processed data
-    analyzer.export_processed_data(f'{args.output_dir}/processed_data.csv')
+    analyzer.export_processed_data(f'{args.output_dir}/processed_data.{args.format}', file_format=args.format)
     
     print(f"\\nAnalysis complete. Results saved to {args.output_dir}/")
 
@@ -1,6 +1,5 @@
 import os
 import base64
-import pickle
 import json
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -10,16 +9,23 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
-# If modifying scopes, delete the token.pickle file first
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
+# If modifying scopes, delete the token.json file first
 SCOPES = ['https://www.googleapis.com/auth/gmail.send']
 
 def get_gmail_service():
     """Authenticate with Gmail API using OAuth2 and return service object."""
     creds = None
     # Load saved credentials
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
+    if os.path.exists('token.json'):
+        with open('token.json', 'rb') as token:
+            raw = token.read()
+        token_info = orjson.loads(raw) if orjson else json.loads(raw)
+        creds = Credentials.from_authorized_user_info(token_info, SCOPES)
 
     # If no valid creds → authenticate again
     if not creds or not creds.valid:
@@ -31,8 +37,8 @@ def get_gmail_service():
             creds = flow.run_local_server(port=8080)
 
         # Save the credentials for future runs
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
+        with open('token.json', 'w') as token:
+            token.write(creds.to_json())
 
     return build('gmail', 'v1', credentials=creds)
 
@@ -58,38 +64,34 @@ def build_hr_template(profile_data: dict) -> str:
     Build HR-style email body with plain-text table structure from parsed_profile.json.
     No HTML tags, only formatted text.
     """
-    name = profile_data[0].get("name", "N/A")
-    contact = profile_data[0].get("contact_number", "N/A")
-    email = profile_data[0].get("email_id", "N/A")
-    exp = profile_data[0].get("year_of_experience", "N/A")
-    company = profile_data[0].get("current_company_name", "N/A")
-    skills = ", ".join(profile_data[0].get("primary_skills", []))
+    profile = profile_data[0]
 
     # Define table content (list of rows)
     rows = [
-        ("Name", name),
-        ("Contact Number", contact),
-        ("Email Id", email),
-        ("Year of Exp", exp),
-        ("Current Company Name", company),
-        ("Primary Skills", skills),
+        ("Name", profile.get("name", "N/A")),
+        ("Contact Number", profile.get("contact_number", "N/A")),
+        ("Email Id", profile.get("email_id", "N/A")),
+        ("Year of Exp", profile.get("year_of_experience", "N/A")),
+        ("Current Company Name", profile.get("current_company_name", "N/A")),
+        ("Primary Skills", ", ".join(profile.get("primary_skills", []))),
     ]
 
     # Calculate column width for nice alignment
-    col_width = max(len(row[0]) for row in rows) + 2
+    col_width = max(len(heading) for heading, _ in rows) + 2
+    border = "=" * (col_width + 40)
 
     # Build table string
-    table_lines = []
-    table_lines.append("=" * (col_width + 40))  # table border
-    for heading, value in rows:
-        table_lines.append(f"{heading:<{col_width}} | {value}")
-    table_lines.append("=" * (col_width + 40))
+    table = "\n".join([
+        border,
+        *(f"{heading:<{col_width}} | {value}" for heading, value in rows),
+        border,
+    ])
 
     # Final email body
     text_body = (
         "Dear HR Team,\n\n"
         "Please find below candidate profile details for your review:\n\n"
-        + "\n".join(table_lines) +
+        + table +
         "\n\nKindly proceed with the next steps in the recruitment process.\n\n"
         "Regards,\nRecruitment Bot"
     )
@@ -1,13 +1,20 @@
 import os
 import re
 import json
+import asyncio
 import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
 from pydantic import BaseModel, EmailStr, HttpUrl, ValidationError, conint
 from typing import List, Optional
 from openai import OpenAI
 import os
 import google.generativeai as genai
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
 # -------------------------------
 # 1. Setup OpenAI API Key
 # -------------------------------
@@ -35,11 +42,8 @@ class Candidate(BaseModel):
 # 3. Function to Extract Text from PDF
 # -------------------------------
 def extract_text_from_pdf(pdf_path: str) -> str:
-    text = ""
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text.strip()
+        return "\n".join((page.extract_text() or "") for page in pdf.pages).strip()
 
 # -------------------------------
 # 4. Few-Shot Prompt for Resume Parsing
@@ -102,7 +106,7 @@ def parse_resume_with_gemini(text, file_name):
     try:
         response = model.generate_content( prompt,
     generation_config={"response_mime_type": "application/json"})
-        parsed_json = json.loads(response.text)  # Ensure it’s valid JSON
+        parsed_json = orjson.loads(response.text) if orjson else json.loads(response.text)  # Ensure it’s valid JSON
         return parsed_json
     except Exception as e:
         print(f"❌ Gemini parse failed: {e}")
@@ -143,20 +147,38 @@ def parse_resume_with_openai(resume_text: str, source_file: str):
 # -------------------------------
 # 5. Process All PDFs in a Folder
 # -------------------------------
+MAX_CONCURRENT_REQUESTS = 8  # Keep within Gemini quota
+
+async def parse_resumes_concurrently(texts, pdf_paths):
+    """Run Gemini calls concurrently, at most MAX_CONCURRENT_REQUESTS at a time."""
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def parse_one(text, pdf_path):
+        async with sem:
+            #return await asyncio.to_thread(parse_resume_with_openai, text, pdf_path)
+            return await asyncio.to_thread(parse_resume_with_gemini, text, pdf_path)
+
+    return await asyncio.gather(*(parse_one(text, pdf_path) for text, pdf_path in zip(texts, pdf_paths)))
+
 def process_resumes(folder_path: str, output_file: str = "candidates.json"):
-    results = []
-    for file in os.listdir(folder_path):
-        if file.lower().endswith(".pdf"):
-            pdf_path = os.path.join(folder_path, file)
-            text = extract_text_from_pdf(pdf_path)
-            #candidate = parse_resume_with_openai(text, pdf_path)
-            candidate = parse_resume_with_gemini(text, pdf_path)
-            if candidate:
-                results.append(candidate)
+    pdf_paths = [os.path.join(folder_path, file)
+                 for file in os.listdir(folder_path) if file.lower().endswith(".pdf")]
+
+    # Text extraction is CPU-bound and independent per file
+    with ProcessPoolExecutor() as executor:
+        texts = list(executor.map(extract_text_from_pdf, pdf_paths))
+
+    # LLM calls are network-bound, so run them concurrently
+    candidates = asyncio.run(parse_resumes_concurrently(texts, pdf_paths))
+    results = [candidate for candidate in candidates if candidate]
     
     # Save output
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    if orjson:
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
     print(f"✅ Parsing complete. Results saved to {output_file}")
 
 # -------------------------------
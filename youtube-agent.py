@@ -1,7 +1,8 @@
 import os
 import json
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -56,6 +57,7 @@ def simulate_ad_events(video_id: str, video_duration: int) -> list:
     This replaces the non-existent direct ad event API call.
     """
     ad_events = []
+    base_ms = datetime.now().timestamp() * 1000  # Milliseconds for pandas conversion
     
     # 1. Pre-roll Ad (Guaranteed)
     ad_events.append({
@@ -64,7 +66,7 @@ def simulate_ad_events(video_id: str, video_duration: int) -> list:
         'position': 'pre-roll',
         'duration': random.choice([15, 30]),
         'video_time': 0, # Start time is 0 for pre-roll
-        'startTime': datetime.now().timestamp() * 1000 # Milliseconds for pandas conversion
+        'startTime': base_ms
     })
     
     # 2. Mid-roll Ads (Based on length)
@@ -80,7 +82,7 @@ def simulate_ad_events(video_id: str, video_duration: int) -> list:
                 'position': 'mid-roll',
                 'duration': random.choice([6, 30]),
                 'video_time': start_time_sec,
-                'startTime': (datetime.now() + timedelta(seconds=start_time_sec + 5)).timestamp() * 1000 
+                'startTime': base_ms + (start_time_sec + 5) * 1000
             })
 
     # 3. Post-roll Ad (Less common, but possible)
@@ -91,12 +93,75 @@ def simulate_ad_events(video_id: str, video_duration: int) -> list:
             'position': 'post-roll',
             'duration': 5,
             'video_time': video_duration, # Ad starts at the end
-            'startTime': (datetime.now() + timedelta(seconds=video_duration + 10)).timestamp() * 1000
+            'startTime': base_ms + (video_duration + 10) * 1000
         })
 
     return ad_events
 
 
+def simulate_ad_events_bulk(video_data: list) -> pd.DataFrame:
+    """
+    Vectorized version of simulate_ad_events for a whole list of videos.
+    Generates the same pre-roll / mid-roll / post-roll schedule in a few NumPy
+    passes and returns the events as a DataFrame (one row per ad).
+    """
+    rng = np.random.default_rng()
+    now_ms = datetime.now().timestamp() * 1000  # Taken once for the whole batch
+
+    video_ids = np.array([v['video_id'] for v in video_data], dtype=object)
+    durations = np.array([v['video_duration'] for v in video_data], dtype=np.int64)
+    n_videos = len(video_ids)
+    video_idx = np.arange(n_videos)
+
+    # 1. Pre-roll Ad (Guaranteed, one per video)
+    pre = {
+        'idx': video_idx,
+        'ad_type': np.full(n_videos, 'non-skippable', dtype=object),
+        'position': np.full(n_videos, 'pre-roll', dtype=object),
+        'duration': rng.choice([15, 30], size=n_videos),
+        'video_time': np.zeros(n_videos, dtype=np.int64),
+        'startTime': np.full(n_videos, now_ms),
+    }
+
+    # 2. Mid-roll Ads (one every 10 mins for videos longer than 10 minutes)
+    mid_counts = np.where(durations > 600, durations // 600, 0)
+    n_mid = int(mid_counts.sum())
+    mid_idx = np.repeat(video_idx, mid_counts)
+    # 1-based ad break number within each video
+    breaks = np.arange(n_mid) - np.repeat(np.cumsum(mid_counts) - mid_counts, mid_counts) + 1
+    mid_start_sec = np.minimum(breaks * 600, durations[mid_idx] - 60)
+    mid = {
+        'idx': mid_idx,
+        'ad_type': rng.choice(np.array(['skippable', 'bumper'], dtype=object), size=n_mid),
+        'position': np.full(n_mid, 'mid-roll', dtype=object),
+        'duration': rng.choice([6, 30], size=n_mid),
+        'video_time': mid_start_sec,
+        'startTime': now_ms + (mid_start_sec + 5) * 1000,
+    }
+
+    # 3. Post-roll Ad (20% chance per video)
+    post_idx = video_idx[rng.random(n_videos) < 0.2]
+    n_post = len(post_idx)
+    post = {
+        'idx': post_idx,
+        'ad_type': np.full(n_post, 'display', dtype=object),
+        'position': np.full(n_post, 'post-roll', dtype=object),
+        'duration': np.full(n_post, 5),
+        'video_time': durations[post_idx],
+        'startTime': now_ms + (durations[post_idx] + 10) * 1000,
+    }
+
+    columns = {key: np.concatenate([pre[key], mid[key], post[key]]) for key in pre}
+    # Stable sort keeps pre-roll -> mid-roll -> post-roll order within each video
+    idx = columns.pop('idx')
+    order = np.argsort(idx, kind='stable')
+
+    return pd.DataFrame({
+        'video_id': video_ids[idx[order]],
+        **{key: values[order] for key, values in columns.items()},
+    })
+
+
 # --- Agent Execution Logic ---
 def run_ad_agent():
     """Main function to run the OpenAI Agent process."""
@@ -145,15 +210,9 @@ def run_ad_agent():
             video_data = json.loads(tool_output).get("trending_videos", [])
             
             # 3. Data Processing & Simulation (This is where the agent's *output* is generated)
-            final_data = []
-            
-            # Simulate ad events for each trending video
-            for video in video_data:
-                events = simulate_ad_events(video['video_id'], video['video_duration'])
-                final_data.extend(events)
-            
+            # Simulate ad events for all trending videos in one vectorized pass
             # 4. Format the final output using pandas as requested
-            df_data = pd.DataFrame(final_data)
+            df_data = simulate_ad_events_bulk(video_data)
             
             # The requested 'timestamp' conversion using pd.to_datetime
             df_data['timestamp'] = pd.to_datetime(df_data['startTime'], unit='ms')